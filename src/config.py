@@ -18,15 +18,22 @@ class Settings:
     DATABASE_URL: str = (
         f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_WARM_SIZE: int = int(os.getenv("DB_POOL_WARM_SIZE", "2"))
+    DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
     REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
     S3_HOST: str = os.getenv("S3_HOST", "http://127.0.0.1")
     S3_PORT: int = int(os.getenv("S3_PORT", "9000"))
     S3_ENDPOINT: str = f"{S3_HOST}:{S3_PORT}"
+    S3_REGION: str = os.getenv("S3_REGION", "us-east-1")
     S3_ACCESS_KEY_ID: str = str(os.getenv("S3_ACCESS_KEY_ID"))
     S3_ACCESS_KEY: str = str(os.getenv("S3_ACCESS_KEY"))
     S3_BUCKET: str = os.getenv("S3_BUCKET", "test")
+    S3_CA_BUNDLE: str = os.getenv("S3_CA_BUNDLE", "")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG")
     LOG_PATH: str = os.getenv("LOG_PATH", "./logs")
@@ -1,13 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Dict
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from src.config import Settings
 from src.logger import logger
+from src.models.database import engine
+from src.redis import close_redis
 from src.routes import index, s3
 from src.utils import get_current_date_time
 
-app = FastAPI()
+
+def close_warm_up_connection(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is None:
+        task.result().close()
+
+
+async def warm_up_db_pool() -> None:
+    """Open a few pooled connections up front so the first requests after boot skip the connection handshakes."""
+    warm_size = min(Settings.DB_POOL_WARM_SIZE, Settings.DB_POOL_SIZE)
+    tasks = [asyncio.ensure_future(run_in_threadpool(engine.connect)) for _ in range(warm_size)]
+    if not tasks:
+        return
+    # Startup must finish quickly even if the database is unreachable, or gunicorn kills the worker.
+    done, pending = await asyncio.wait(tasks, timeout=Settings.DB_CONNECT_TIMEOUT)
+    for task in done | pending:
+        task.add_done_callback(close_warm_up_connection)
+    errors = [task.exception() for task in done if task.exception() is not None]
+    if pending:
+        logger.warning("Timed out warming up the database pool after %ss", Settings.DB_CONNECT_TIMEOUT)
+    elif errors:
+        logger.warning("Could not warm up the database pool: %s", errors[0])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_db_pool()
+    yield
+    # Close pooled connections on shutdown instead of leaving Postgres and Redis to time them out.
+    engine.dispose()
+    await close_redis()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 app.include_router(index.router)
 app.include_router(s3.router)
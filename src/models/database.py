@@ -7,7 +7,14 @@ from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import Settings
 
-engine = create_engine(Settings.DATABASE_URL)
+engine = create_engine(
+    Settings.DATABASE_URL,
+    pool_size=Settings.DB_POOL_SIZE,
+    max_overflow=Settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    # Without it an unreachable host blocks until the OS gives up on the TCP connect, minutes later.
+    connect_args={"connect_timeout": Settings.DB_CONNECT_TIMEOUT},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
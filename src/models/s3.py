@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, Column, String, bindparam, select
 
 from src.models.database import BaseModel
 from src.s3 import get_object_url
@@ -11,6 +13,7 @@ class S3Object(BaseModel):
     object_name = Column(String(255), nullable=False)
     file_name = Column(String(255), nullable=False)
     file_type = Column(String(255), nullable=False)
+    file_size = Column(BigInteger, nullable=True)
 
     @property
     def url(self):
@@ -22,3 +25,24 @@ class S3Object(BaseModel):
     def get_full_url(self):
         url = get_object_url(self.bucket_name, self.object_name)
         return url
+
+    @classmethod
+    def get_page(cls, db, limit: int, skip: int = 0, after_id: Optional[int] = None) -> Any:
+        """Get a page of objects, newest first, either after the after_id cursor or at the skip offset."""
+        if after_id is not None:
+            return db.execute(_select_page_after_id, {"limit": limit, "after_id": after_id}).all()
+        return db.execute(_select_page_at_offset, {"limit": limit, "skip": skip}).all()
+
+
+# Built once with bound parameters so every request reuses the same cached compiled statement.
+_select_page = select(
+    S3Object.id,
+    S3Object.bucket_name,
+    S3Object.object_name,
+    S3Object.file_name,
+    S3Object.file_type,
+    S3Object.file_size,
+    S3Object.created_at,
+).order_by(S3Object.id.desc())
+_select_page_after_id = _select_page.where(S3Object.id < bindparam("after_id")).limit(bindparam("limit"))
+_select_page_at_offset = _select_page.limit(bindparam("limit")).offset(bindparam("skip"))
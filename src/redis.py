@@ -1,5 +1,37 @@
-from redis import Redis
+from typing import Optional
+
+from redis.asyncio import ConnectionPool, Redis
 
 from src.config import Settings
 
-redis_conn = Redis(host=Settings.REDIS_HOST, port=Settings.REDIS_PORT, db=Settings.REDIS_DB)
+redis_client: Optional[Redis] = None
+
+
+async def get_redis() -> Redis:
+    """Get the shared Redis client, creating its connection pool on first use.
+
+    This is async so FastAPI calls it on the event loop: the client must be created there,
+    and a cached lookup should not pay for a threadpool hop on every request.
+    Returns:
+        redis.asyncio.Redis: The Redis client."""
+
+    global redis_client
+    if redis_client is None:
+        # Bounded timeouts make an unreachable Redis fail fast, so callers fall back instead of hanging the request.
+        pool = ConnectionPool.from_url(
+            Settings.REDIS_URL,
+            max_connections=Settings.REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+        redis_client = Redis(connection_pool=pool)
+    return redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client's connection pool, if it was ever created."""
+
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose(close_connection_pool=True)
+        redis_client = None
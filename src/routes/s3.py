@@ -1,33 +1,102 @@
-from fastapi import APIRouter, Depends, File, Request, UploadFile
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from src.config import Settings
 from src.logger import logger
 from src.models.database import get_db
 from src.models.s3 import S3Object
-from src.s3 import upload_object_to_s3
+from src.redis import get_redis
+from src.s3 import MAX_CONCURRENT_UPLOADS, get_object_urls, upload_object_to_s3
+from src.schemas import S3ObjectList
+from src.utils import get_file_size
 
 router = APIRouter()
 
+MAX_BATCH_FILES = 20
+
 
 @router.post("/s3-upload")
 async def s3_upload(request: Request, file: UploadFile = File(...), db=Depends(get_db)):
     if not file or not file.filename:
         logger.error("No file uploaded")
         return {"result": "fail"}
-    filename = upload_object_to_s3(file.filename, file.file, Settings.S3_BUCKET)
+    file_size = get_file_size(file.file)
+    filename = await run_in_threadpool(upload_object_to_s3, file.filename, file.file, Settings.S3_BUCKET)
     if not filename:
         logger.error("Failed to upload file to S3")
         return {"result": "fail"}
     s3_object = S3Object(
-        file_name=filename, file_type=file.content_type, bucket_name=Settings.S3_BUCKET, object_name=filename
+        file_name=file.filename,
+        file_type=file.content_type,
+        file_size=file_size,
+        bucket_name=Settings.S3_BUCKET,
+        object_name=filename,
     )
     db.add(s3_object)
     db.commit()
     return {"result": "success"}
 
 
-@router.get("/s3-objects")
-async def s3_objects(request: Request, db=Depends(get_db)):
-    s3_objects = db.query(S3Object).all()
+@router.post("/s3-upload-batch")
+async def s3_upload_batch(request: Request, files: List[UploadFile] = File(...), db=Depends(get_db)):
+    """Upload several files to S3 in parallel and record the ones that succeeded in a single commit."""
+    if not files or not all(file.filename for file in files):
+        logger.error("No file uploaded")
+        return {"result": "fail"}
+    if len(files) > MAX_BATCH_FILES:
+        logger.error("Too many files in one batch: %d > %d", len(files), MAX_BATCH_FILES)
+        return {"result": "fail"}
+    file_sizes = [get_file_size(file.file) for file in files]
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+    async def upload(file: UploadFile):
+        async with semaphore:
+            return await run_in_threadpool(upload_object_to_s3, file.filename, file.file, Settings.S3_BUCKET)
+
+    # One failed upload must not discard the others, which are already in S3 and need their rows.
+    filenames = await asyncio.gather(*(upload(file) for file in files), return_exceptions=True)
+    results = []
+    for file, file_size, filename in zip(files, file_sizes, filenames):
+        if not filename or isinstance(filename, BaseException):
+            logger.error("Failed to upload %s to S3: %s", file.filename, filename)
+            results.append({"file_name": file.filename, "result": "fail"})
+            continue
+        db.add(
+            S3Object(
+                file_name=file.filename,
+                file_type=file.content_type,
+                file_size=file_size,
+                bucket_name=Settings.S3_BUCKET,
+                object_name=filename,
+            )
+        )
+        results.append({"file_name": file.filename, "result": "success"})
+    db.commit()
+    failed = any(result["result"] == "fail" for result in results)
+    return {"result": "fail" if failed else "success", "files": results}
 
-    return {"s3_objects": s3_objects}
+
+@router.get("/s3-objects", response_model=S3ObjectList)
+async def s3_objects(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = Query(None, ge=1),
+    db=Depends(get_db),
+    redis=Depends(get_redis),
+):
+    """List S3 objects, newest first. Pass the previous page's next_cursor as after_id to page by id."""
+    s3_objects = S3Object.get_page(db, limit, skip=skip, after_id=after_id)
+    urls = await get_object_urls(redis, ((row.bucket_name, row.object_name) for row in s3_objects))
+    # Validate and serialise the whole page in one pydantic-core pass instead of letting
+    # FastAPI dump and re-validate every row against response_model.
+    page = S3ObjectList.model_validate(
+        {
+            "s3_objects": [dict(row._mapping, url=url) for row, url in zip(s3_objects, urls)],
+            "next_cursor": s3_objects[-1].id if len(s3_objects) == limit else None,
+        }
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
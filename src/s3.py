@@ -1,33 +1,129 @@
+import asyncio
+import base64
+import os
+import re
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
+from botocore.credentials import Credentials
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from src.config import Settings
 from src.logger import logger
 
+MB = 1024 * 1024
+S3_MAX_POOL_CONNECTIONS = 50
+# boto3 already defaults to 8MB multipart parts on threads; concurrency is lowered from 10 to 8 so
+# several parallel uploads fit in the client's connection pool, and reads use 1MB instead of 256KB.
+transfer_config = TransferConfig(io_chunksize=MB, max_concurrency=8)
+# How many uploads can run side by side without their parts queueing for a pooled connection.
+MAX_CONCURRENT_UPLOADS = S3_MAX_POOL_CONNECTIONS // transfer_config.max_concurrency
+# Only short alphanumeric extensions are kept; anything else could break the url or the key's charset.
+OBJECT_EXTENSION_PATTERN = re.compile(r"\.[a-z0-9]{1,10}")
+PRESIGNED_URL_EXPIRY = 3600
+# Cached urls are dropped well before they expire so clients never get a dead link.
+PRESIGNED_URL_CACHE_TTL = PRESIGNED_URL_EXPIRY - 300
+# Signing is CPU work, so it gets its own small pool rather than competing with the default executor.
+presign_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="s3-presign")
+
+
+s3_client = None
+s3_client_lock = threading.Lock()
+
 
 def get_s3_client():
-    """Get S3 client.
+    """Get the shared S3 client, creating it on first use.
+
+    Uploads call this from several threadpool workers at once, so creation is serialised and
+    uses its own session rather than boto3's default one, which is not thread-safe.
     Returns:
         boto3.client: The S3 client."""
 
-    s3_client = boto3.client(
-        "s3",
-        endpoint_url=Settings.S3_ENDPOINT,
-        aws_access_key_id=Settings.S3_ACCESS_KEY_ID,
-        aws_secret_access_key=Settings.S3_ACCESS_KEY,
-        aws_session_token=None,
-        verify=False,
-    )
+    global s3_client
+    if s3_client is None:
+        with s3_client_lock:
+            if s3_client is None:
+                s3_client = boto3.session.Session().client(
+                    "s3",
+                    endpoint_url=Settings.S3_ENDPOINT,
+                    aws_access_key_id=Settings.S3_ACCESS_KEY_ID,
+                    aws_secret_access_key=Settings.S3_ACCESS_KEY,
+                    aws_session_token=None,
+                    verify=Settings.S3_CA_BUNDLE or True,
+                    config=Config(
+                        tcp_keepalive=True,
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 3, "mode": "adaptive"},
+                        connect_timeout=2,
+                        read_timeout=60,
+                    ),
+                )
     return s3_client
 
 
+def generate_object_name(file_name: str) -> str:
+    """Generate a unique, URL-safe S3 object name that keeps the file's extension.
+    Args:
+        file_name (str): Original name of the file.
+    Returns:
+        str: A 22 character random key followed by the lowercased extension, if it is a short alphanumeric one."""
+
+    key = base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode()
+    extension = os.path.splitext(file_name)[1].lower()
+    if not OBJECT_EXTENSION_PATTERN.fullmatch(extension):
+        extension = ""
+    return f"{key}{extension}"
+
+
+class CachedKeyS3SigV4QueryAuth(S3SigV4QueryAuth):
+    """SigV4 query-string signer that derives the signing key once per day instead of once per url.
+
+    The key only depends on the secret, date, region and service, so the four HMACs that
+    derive it can be shared by every url signed on the same day."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._signing_keys: Dict[str, bytes] = {}
+
+    def signature(self, string_to_sign, request):
+        datestamp = request.context["timestamp"][0:8]
+        signing_key = self._signing_keys.get(datestamp)
+        if signing_key is None:
+            k_date = self._sign(f"AWS4{self.credentials.secret_key}".encode(), datestamp)
+            k_region = self._sign(k_date, self._region_name)
+            k_service = self._sign(k_region, self._service_name)
+            signing_key = self._sign(k_service, "aws4_request")
+            # Swap in a new dict rather than mutating so concurrent signers never see a partial update.
+            self._signing_keys = {datestamp: signing_key}
+        return self._sign(signing_key, string_to_sign, hex=True)
+
+
+@lru_cache(maxsize=1)
+def get_presigner() -> S3SigV4QueryAuth:
+    """Get the shared SigV4 query-string signer used for presigned GET urls.
+    Returns:
+        S3SigV4QueryAuth: The signer."""
+
+    credentials = Credentials(Settings.S3_ACCESS_KEY_ID, Settings.S3_ACCESS_KEY)
+    return CachedKeyS3SigV4QueryAuth(credentials, "s3", Settings.S3_REGION, expires=PRESIGNED_URL_EXPIRY)
+
+
 def upload_object_to_s3(file_name: str, file, bucket: str = Settings.S3_BUCKET):
-    filename = f"{uuid.uuid4().hex}{file_name}"
+    filename = generate_object_name(file_name)
     s3_client = get_s3_client()
     if not s3_client:
         return
-    s3_client.upload_fileobj(file, bucket, filename)
+    s3_client.upload_fileobj(file, bucket, filename, Config=transfer_config)
     logger.info("Uploaded %s to %s", filename, bucket)
     return filename
 
@@ -58,10 +154,55 @@ def get_object_url(bucket_name, object_name):
     Returns:
         str: The url of the object."""
 
-    s3_client = get_s3_client()
+    # Signing the request directly skips the client's event hooks, endpoint resolution and
+    # parameter serialisation, which cost several times more than the signature itself.
+    request = AWSRequest(method="GET", url=f"{Settings.S3_ENDPOINT}/{bucket_name}/{quote(object_name, safe='/~')}")
     try:
-        url = s3_client.generate_presigned_url("get_object", Params={"Bucket": bucket_name, "Key": object_name})
+        get_presigner().add_auth(request)
     except Exception as e:
         logger.error(e)
         return None
-    return url
+    return request.url
+
+
+async def get_object_urls(redis: Redis, objects: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+    """Get the urls of many objects in S3, reusing presigned urls cached in Redis.
+    Args:
+        redis (redis.asyncio.Redis): Redis client holding the url cache.
+        objects (Iterable[Tuple[str, str]]): (bucket name, object name) pairs.
+    Returns:
+        List[Optional[str]]: The url of each object, in the same order."""
+
+    objects = list(objects)
+    if not objects:
+        return []
+    keys = [f"s3-url:{bucket_name}:{object_name}" for bucket_name, object_name in objects]
+    try:
+        cached = await redis.mget(keys)
+    except RedisError as e:
+        logger.error(e)
+        return await _sign_object_urls_async(objects)
+
+    misses = [i for i, url in enumerate(cached) if url is None]
+    signed = await _sign_object_urls_async([objects[i] for i in misses])
+    urls = [url.decode() if url is not None else None for url in cached]
+    pipe = redis.pipeline(transaction=False)
+    for i, url in zip(misses, signed):
+        urls[i] = url
+        if url:
+            pipe.setex(keys[i], PRESIGNED_URL_CACHE_TTL, url)
+    try:
+        await pipe.execute()
+    except RedisError as e:
+        logger.error(e)
+    return urls
+
+
+async def _sign_object_urls_async(objects: List[Tuple[str, str]]) -> List[Optional[str]]:
+    if not objects:
+        return []
+    return await asyncio.get_running_loop().run_in_executor(presign_executor, _sign_object_urls, objects)
+
+
+def _sign_object_urls(objects: List[Tuple[str, str]]) -> List[Optional[str]]:
+    return [get_object_url(bucket_name, object_name) for bucket_name, object_name in objects]
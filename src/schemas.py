@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class S3ObjectResponse(BaseModel):
+    """Public representation of an uploaded S3 object."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    bucket_name: str
+    object_name: str
+    file_name: str
+    file_type: str
+    file_size: Optional[int] = None
+    created_at: Optional[datetime] = None
+    url: Optional[str] = None
+
+
+class S3ObjectList(BaseModel):
+    """A page of S3 objects."""
+
+    s3_objects: List[S3ObjectResponse]
+    next_cursor: Optional[int] = None
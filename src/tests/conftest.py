@@ -0,0 +1,115 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.models import Base
+from src.models.database import get_db
+from src.redis import get_redis
+
+# The FastAPI app is imported inside the fixtures that need it, so running a subset of tests
+# (e.g. with -k) that never touches the client does not pay for building the app at collection.
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the presigned url cache; set down to simulate an outage."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.down = False
+
+    def check(self):
+        if self.down:
+            raise RedisConnectionError("Redis is down")
+
+    async def mget(self, keys):
+        self.check()
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    async def execute(self):
+        self.redis.check()
+        for key, ttl, value in self.commands:
+            self.redis.store[key] = value.encode()
+            self.redis.ttls[key] = ttl
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole run; entering it runs the app's lifespan once per session."""
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    async def skip_warm_up():
+        pass
+
+    # Every request gets an empty cache unless a test asks for the redis fixture.
+    app.dependency_overrides[get_redis] = lambda: FakeRedis()
+    # The warm-up would connect to the configured database, which tests replace with SQLite.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("src.main.warm_up_db_pool", skip_warm_up)
+        with TestClient(app) as client:
+            yield client
+    app.dependency_overrides.pop(get_redis)
+
+
+@pytest.fixture
+def redis():
+    """A FakeRedis shared by the test and the app for the duration of the test."""
+    from src.main import app
+
+    redis = FakeRedis()
+    previous = app.dependency_overrides.get(get_redis)
+    app.dependency_overrides[get_redis] = lambda: redis
+    yield redis
+    if previous is None:
+        app.dependency_overrides.pop(get_redis)
+    else:
+        app.dependency_overrides[get_redis] = previous
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    # Let SQLAlchemy issue BEGIN itself; pysqlite's own transaction handling breaks SAVEPOINTs.
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_transaction(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(db_engine):
+    """A session whose commits are rolled back after the test, injected into the app's get_db."""
+    from src.main import app
+
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    app.dependency_overrides[get_db] = lambda: session
+    yield session
+    app.dependency_overrides.pop(get_db)
+    session.close()
+    transaction.rollback()
+    connection.close()
@@ -1,14 +1,40 @@
-from src.tests.utils import client
+import asyncio
+import threading
+import time
 
+from src.config import Settings
 
-def test_read_main():
+
+def test_read_main(client):
     response = client.get("/test")
     assert response.status_code == 200
     response_json = response.json()
     assert response_json["result"] == "success"
 
 
-def test_index():
+def test_index(client):
     response = client.get("/")
     assert response.status_code == 200
     assert b"awesome" in response.content
+
+
+def test_warm_up_db_pool_gives_up_on_slow_database(monkeypatch):
+    from src.main import warm_up_db_pool
+
+    connected = threading.Event()
+
+    class SlowConnection:
+        def close(self):
+            pass
+
+    class SlowEngine:
+        def connect(self):
+            connected.wait(2)
+            return SlowConnection()
+
+    monkeypatch.setattr("src.main.engine", SlowEngine())
+    monkeypatch.setattr(Settings, "DB_CONNECT_TIMEOUT", 0.1)
+    start = time.monotonic()
+    asyncio.run(warm_up_db_pool())
+    connected.set()
+    assert time.monotonic() - start < 1
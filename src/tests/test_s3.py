@@ -0,0 +1,248 @@
+import asyncio
+import datetime
+import threading
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
+from botocore.credentials import Credentials
+
+from src import redis as redis_module
+from src.config import Settings
+from src.models import S3Object
+from src.routes.s3 import MAX_BATCH_FILES
+from src.s3 import (
+    MAX_CONCURRENT_UPLOADS,
+    PRESIGNED_URL_CACHE_TTL,
+    PRESIGNED_URL_EXPIRY,
+    CachedKeyS3SigV4QueryAuth,
+    generate_object_name,
+    get_object_url,
+    get_object_urls,
+    get_s3_client,
+)
+
+
+@pytest.fixture
+def fake_upload(monkeypatch):
+    monkeypatch.setattr("src.routes.s3.upload_object_to_s3", lambda file_name, file, bucket: f"key-{file_name}")
+
+
+@pytest.fixture
+def signed(monkeypatch):
+    """Records every object signed instead of presigning it."""
+    signed = []
+
+    def fake_get_object_url(bucket_name, object_name):
+        signed.append(object_name)
+        return f"signed-{object_name}"
+
+    monkeypatch.setattr("src.s3.get_object_url", fake_get_object_url)
+    return signed
+
+
+def test_s3_client_is_cached():
+    assert get_s3_client() is get_s3_client()
+
+
+def test_s3_client_is_created_once_under_concurrency(monkeypatch):
+    monkeypatch.setattr("src.s3.s3_client", None)
+    barrier = threading.Barrier(MAX_CONCURRENT_UPLOADS)
+    clients = []
+
+    def create():
+        barrier.wait()
+        clients.append(get_s3_client())
+
+    threads = [threading.Thread(target=create) for _ in range(MAX_CONCURRENT_UPLOADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_s3_objects_keyset_pagination(client, db, redis):
+    for i in range(5):
+        S3Object(bucket_name="test", object_name=f"key-{i}", file_name=f"{i}.txt", file_type="text/plain").save(db)
+
+    first = client.get("/s3-objects", params={"limit": 2}).json()
+    assert [obj["id"] for obj in first["s3_objects"]] == [5, 4]
+    assert first["next_cursor"] == 4
+    assert set(redis.store) == {"s3-url:test:key-4", "s3-url:test:key-3"}
+
+    second = client.get("/s3-objects", params={"limit": 2, "after_id": first["next_cursor"]}).json()
+    assert [obj["id"] for obj in second["s3_objects"]] == [3, 2]
+
+    last = client.get("/s3-objects", params={"limit": 2, "after_id": second["next_cursor"]}).json()
+    assert [obj["id"] for obj in last["s3_objects"]] == [1]
+    assert last["next_cursor"] is None
+    assert last["s3_objects"][0]["url"]
+
+
+def test_redis_client_is_shared_until_closed():
+    async def check():
+        client = await redis_module.get_redis()
+        assert await redis_module.get_redis() is client
+        await redis_module.close_redis()
+        assert redis_module.redis_client is None
+
+    asyncio.run(check())
+
+
+def test_object_urls_cache_hit(redis, signed):
+    redis.store["s3-url:b:cached"] = b"cached-url"
+    assert asyncio.run(get_object_urls(redis, [("b", "cached")])) == ["cached-url"]
+    assert signed == []
+
+
+def test_object_urls_cache_partial_miss(redis, signed):
+    redis.store["s3-url:b:cached"] = b"cached-url"
+    urls = asyncio.run(get_object_urls(redis, [("b", "new"), ("b", "cached")]))
+    assert urls == ["signed-new", "cached-url"]
+    assert signed == ["new"]
+    assert redis.store["s3-url:b:new"] == b"signed-new"
+    assert redis.ttls == {"s3-url:b:new": PRESIGNED_URL_CACHE_TTL}
+
+
+def test_object_urls_redis_down(redis, signed):
+    redis.down = True
+    assert asyncio.run(get_object_urls(redis, [("b", "x"), ("b", "y")])) == ["signed-x", "signed-y"]
+    assert redis.store == {}
+
+
+def test_s3_upload_records_file_size(client, db, fake_upload):
+    response = client.post("/s3-upload", files={"file": ("hello.txt", b"hello world", "text/plain")})
+    assert response.json() == {"result": "success"}
+    s3_object = db.query(S3Object).one()
+    assert s3_object.file_name == "hello.txt"
+    assert s3_object.object_name == "key-hello.txt"
+    assert s3_object.file_size == 11
+
+
+def test_s3_upload_batch_commits_all_files(client, db, fake_upload):
+    response = client.post(
+        "/s3-upload-batch",
+        files=[
+            ("files", ("a.txt", b"a", "text/plain")),
+            ("files", ("b.csv", b"b,c", "text/csv")),
+        ],
+    )
+    assert response.json() == {
+        "result": "success",
+        "files": [{"file_name": "a.txt", "result": "success"}, {"file_name": "b.csv", "result": "success"}],
+    }
+    s3_objects = db.query(S3Object).order_by(S3Object.id).all()
+    assert [(obj.file_name, obj.file_type, obj.file_size) for obj in s3_objects] == [
+        ("a.txt", "text/plain", 1),
+        ("b.csv", "text/csv", 3),
+    ]
+
+
+def test_s3_upload_batch_keeps_successful_files(client, db, monkeypatch):
+    def flaky_upload(file_name, file, bucket):
+        if file_name == "error.txt":
+            raise RuntimeError("connection reset")
+        if file_name == "none.txt":
+            return None
+        return f"key-{file_name}"
+
+    monkeypatch.setattr("src.routes.s3.upload_object_to_s3", flaky_upload)
+    response = client.post(
+        "/s3-upload-batch",
+        files=[("files", (name, b"x", "text/plain")) for name in ("a.txt", "error.txt", "none.txt", "b.txt")],
+    )
+    assert response.json() == {
+        "result": "fail",
+        "files": [
+            {"file_name": "a.txt", "result": "success"},
+            {"file_name": "error.txt", "result": "fail"},
+            {"file_name": "none.txt", "result": "fail"},
+            {"file_name": "b.txt", "result": "success"},
+        ],
+    }
+    assert [obj.object_name for obj in db.query(S3Object).order_by(S3Object.id)] == ["key-a.txt", "key-b.txt"]
+
+
+def test_s3_upload_batch_rejects_too_many_files(client, db, fake_upload):
+    files = [("files", (f"{i}.txt", b"x", "text/plain")) for i in range(MAX_BATCH_FILES + 1)]
+    assert client.post("/s3-upload-batch", files=files).json() == {"result": "fail"}
+    assert db.query(S3Object).count() == 0
+
+
+def test_generate_object_name_is_url_safe():
+    object_name = generate_object_name("My Report (final).PDF")
+    assert object_name.endswith(".pdf")
+    assert len(object_name) == 26
+    assert object_name[:-4].replace("-", "").replace("_", "").isalnum()
+
+
+@pytest.mark.parametrize("file_name", ["x.p df", "a.ü", "../../etc/passwd", "no-extension", "a.verylongextension"])
+def test_generate_object_name_drops_unsafe_extensions(file_name):
+    object_name = generate_object_name(file_name)
+    assert len(object_name) == 22
+    assert object_name.replace("-", "").replace("_", "").isalnum()
+
+
+class FrozenDatetime(datetime.datetime):
+    frozen = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.frozen
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.frozen.replace(tzinfo=tz)
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Freezes the clock botocore signs with; set FrozenDatetime.frozen to move it."""
+    monkeypatch.setattr(FrozenDatetime, "frozen", FrozenDatetime.frozen)
+    monkeypatch.setattr("botocore.auth.datetime", SimpleNamespace(datetime=FrozenDatetime))
+    # Newer botocore reads the clock through a helper rather than datetime.utcnow.
+    monkeypatch.setattr("botocore.auth.get_current_datetime", FrozenDatetime.utcnow, raising=False)
+    return FrozenDatetime
+
+
+@pytest.mark.parametrize("object_name", ["plain.txt", "with space.pdf", "ümlaut.txt", "q?h#a&e=.txt", "a%20b", "a//b"])
+def test_object_url_matches_boto3_presign(frozen_time, object_name):
+    s3_client = boto3.client(
+        "s3",
+        endpoint_url=Settings.S3_ENDPOINT,
+        aws_access_key_id=Settings.S3_ACCESS_KEY_ID,
+        aws_secret_access_key=Settings.S3_ACCESS_KEY,
+        region_name=Settings.S3_REGION,
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+    expected = s3_client.generate_presigned_url(
+        "get_object", Params={"Bucket": "test", "Key": object_name}, ExpiresIn=PRESIGNED_URL_EXPIRY
+    )
+    assert "X-Amz-Date=20240101T120000Z" in expected
+    assert get_object_url("test", object_name) == expected
+
+
+def test_signing_key_is_cached_per_day(frozen_time):
+    signer = CachedKeyS3SigV4QueryAuth(Credentials("id", "secret"), "s3", "us-east-1", expires=PRESIGNED_URL_EXPIRY)
+    reference = S3SigV4QueryAuth(Credentials("id", "secret"), "s3", "us-east-1", expires=PRESIGNED_URL_EXPIRY)
+
+    def sign(auth):
+        request = AWSRequest(method="GET", url="http://localhost/test/key")
+        auth.add_auth(request)
+        return request.url
+
+    assert sign(signer) == sign(reference)
+    signing_keys = signer._signing_keys
+    assert list(signing_keys) == ["20240101"]
+    frozen_time.frozen += datetime.timedelta(hours=1)
+    assert sign(signer) == sign(reference)
+    assert signer._signing_keys is signing_keys
+
+    frozen_time.frozen += datetime.timedelta(days=1)
+    assert sign(signer) == sign(reference)
+    assert list(signer._signing_keys) == ["20240102"]
+    assert signer._signing_keys["20240102"] != signing_keys["20240101"]
@@ -1,5 +1,20 @@
+import os
 from datetime import datetime
+from typing import BinaryIO
 
 
 def get_current_date_time():
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def get_file_size(file: BinaryIO) -> int:
+    """Get the size of a seekable file without reading it, leaving it rewound.
+    Args:
+        file (BinaryIO): The file object.
+    Returns:
+        int: The size of the file in bytes."""
+
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    return size